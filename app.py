@@ -9,17 +9,48 @@
 #     - GET  /health  → estado del servicio y metadatos del modelo
 #     - POST /predict → predicción a partir de 4 características numéricas
 # Uso:
-#   python app.py  → http://127.0.0.1:5002
+#   python app.py  → http://127.0.0.1:5002  (servidor de desarrollo)
+#   gunicorn -c gunicorn.conf.py app:app   (producción, ver Dockerfile)
 # ============================================================================
 
 from __future__ import annotations  # -- Anotaciones de tipo modernas
 
-from flask import Flask, request, jsonify  # -- Framework web y utilidades para JSON
+import os  # -- Operaciones del sistema, paths y variables de entorno
+
+# -- Un hilo nativo por proceso (OpenMP/BLAS/numba): el paralelismo lo dan los
+#    workers de gunicorn; debe fijarse antes de importar numpy/sklearn
+for _var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS", "NUMBA_NUM_THREADS"):
+    os.environ.setdefault(_var, "1")
+
+from flask import Flask, Response, request  # -- Framework web
 import numpy as np  # -- Operaciones numéricas y arrays
+import orjson  # -- Serialización JSON rápida (implementada en C)
+import msgpack  # -- Transporte binario opcional para /predict
 import joblib  # -- Para cargar el modelo entrenado
 from sklearn.datasets import load_iris  # -- Dataset de referencia (por compatibilidad)
-from typing import Tuple, Union  # -- Tipado estático
-import os  # -- Operaciones del sistema, paths y variables de entorno
+from typing import Callable, Dict, List, Tuple, Union  # -- Tipado estático
+from functools import lru_cache  # -- Memoización de predicciones repetidas
+from array import array  # -- Conversión rápida de features a float32
+from threadpoolctl import threadpool_limits  # -- Límite de hilos de librerías nativas ya cargadas
+import queue  # -- Cola de solicitudes para el micro-batching
+import threading  # -- Hilo de fondo que agrupa predicciones
+import time  # -- Ventana temporal del micro-batching
+
+try:
+    from numba import njit  # -- Compilador JIT para recorrer los árboles del bosque
+except ImportError:  # -- Sin numba se usa predict_proba de sklearn
+    njit = None
+
+def _native_threads() -> int:
+    """Hilos nativos por proceso según OMP_NUM_THREADS (p. ej. "4" o "4,2"); 1 si no es válido."""
+    try:
+        return max(1, int(os.environ.get("OMP_NUM_THREADS", "1").split(",")[0]))
+    except ValueError:
+        return 1
+
+
+# -- Por si alguna librería nativa se cargó antes de fijar las variables
+threadpool_limits(limits=_native_threads())
 
 # -- Versión de la API
 API_VERSION = "1.0.0"
@@ -27,14 +58,33 @@ API_VERSION = "1.0.0"
 # -- Ruta del artefacto (modelo entrenado + metadatos), configurable por env
 ARTIFACT_PATH = os.getenv("MODEL_PATH", "modelo.pkl")
 
+# -- Tamaño de las cachés LRU de /predict (vectores de features repetidos)
+CACHE_SIZE = int(os.getenv("PREDICT_CACHE_SIZE", "4096"))
+
+# -- Micro-batching opcional: máximo de filas por lote (1 = desactivado, se predice
+#    en el propio hilo de la solicitud), ventana de espera (0 = despachar en cuanto
+#    llega la solicitud) y timeout
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", "1"))
+BATCH_WAIT_MS = float(os.getenv("BATCH_WAIT_MS", "0"))
+BATCH_TIMEOUT_S = float(os.getenv("BATCH_TIMEOUT_S", "10"))
+
+# -- Máximo de nodos (sumando todos los árboles) para generar el código del bosque
+#    sin numba; por encima, compilar el módulo cuesta más de lo que ahorra
+CODEGEN_MAX_NODES = int(os.getenv("CODEGEN_MAX_NODES", "50000"))
+
+# -- Content-Types aceptados para el transporte binario (msgpack)
+MSGPACK_MIMETYPES = ("application/msgpack", "application/x-msgpack")
+
 # -- Crear instancia Flask
 app = Flask(__name__)  # -- Aplicación principal de Flask
 
 
 # --------------------------- Carga del modelo -------------------------------
 try:
-    # -- Intentar cargar el artefacto desde disco
-    artifact = joblib.load(ARTIFACT_PATH)
+    # -- Intentar cargar el artefacto desde disco (sin comprimir: no hay descompresión xz).
+    #    mmap solo mapea arrays sueltos (p. ej. classes_); los nodos de los árboles
+    #    se copian a memoria propia del proceso al reconstruir cada Tree.
+    artifact = joblib.load(ARTIFACT_PATH, mmap_mode="r")
 
     # -- Si el artefacto es un diccionario con metadatos
     if isinstance(artifact, dict):
@@ -56,13 +106,222 @@ except FileNotFoundError:
     # -- Si el archivo no existe, inicializamos variables vacías
     model, class_names, feature_names, n_features, test_accuracy = None, [], [], 0, 0.0
 
+# -- Métodos del modelo resueltos una sola vez (el tipo de modelo no cambia)
+_pred = model.predict if model is not None else None
+_proba = getattr(model, "predict_proba", None)
+
+
+# ------------------- Recorrido compilado del bosque -------------------------
+def _forest_trees(m) -> Union[Tuple[list, int], None]:
+    """Árboles (``tree_``) del bosque y número de features; None si no es un bosque."""
+    trees = [getattr(est, "tree_", None) for est in getattr(m, "estimators_", [])]
+    if not trees or any(t is None for t in trees):
+        return None
+    return trees, int(getattr(m, "n_features_in_", n_features))
+
+
+def _feature_cuts(trees: list, n_feats: int) -> List[np.ndarray]:
+    """Umbrales distintos y ordenados de cada feature en todo el bosque."""
+    return [
+        np.unique(np.concatenate([t.threshold[t.feature == j] for t in trees]))
+        for j in range(n_feats)
+    ]
+
+
+def _missing_left(t) -> np.ndarray:
+    """Dirección de los NaN por nodo (1 = izquierda); sklearn < 1.3 no la tiene: siempre a la derecha."""
+    return getattr(t, "missing_go_to_left", np.zeros(t.node_count, dtype=np.uint8))
+
+
+def _forest_arrays(m) -> Union[Tuple[np.ndarray, ...], None]:
+    """Empaqueta los nodos de todos los árboles en arrays contiguos por campo (SoA).
+
+    Los árboles van uno tras otro sin relleno (``root[t]`` es el primer nodo
+    del árbol ``t`` y los hijos usan índices globales). Los umbrales se guardan
+    como su rango entre los umbrales distintos de la misma feature (int16, o
+    int32 si no caben; igual el índice de feature) y la entrada se discretiza
+    con los mismos cortes: ``x <= umbral_k`` equivale a
+    ``#{cortes < x} <= k``, así que el resultado es idéntico al de sklearn con
+    nodos de ~10 bytes en lugar de ~40. Los NaN siguen ``missing_go_to_left``
+    de cada nodo, como en sklearn.
+    """
+    forest = _forest_trees(m)
+    if forest is None:
+        return None  # -- No es un bosque de árboles: usar sklearn
+    trees, n_feats = forest
+
+    # -- Cortes por feature: umbrales distintos ordenados, rellenos con +inf
+    cuts = _feature_cuts(trees, n_feats)
+    max_cuts = max(1, max(len(c) for c in cuts))
+    code_dtype = np.int16 if max_cuts < np.iinfo(np.int16).max else np.int32
+    edges = np.full((n_feats, max_cuts), np.inf, dtype=np.float64)
+    for j, c in enumerate(cuts):
+        edges[j, : len(c)] = c
+
+    # -- Desplazamiento de cada árbol dentro de los arrays empaquetados
+    offsets = np.cumsum([0] + [t.node_count for t in trees])
+    root = offsets[:-1].astype(np.int32)
+    n_nodes, n_classes = int(offsets[-1]), trees[0].value.shape[2]
+    feat_dtype = np.int16 if n_feats < np.iinfo(np.int16).max else np.int32
+    feat = np.zeros(n_nodes, dtype=feat_dtype)
+    thr = np.zeros(n_nodes, dtype=code_dtype)
+    ml = np.zeros(n_nodes, dtype=np.uint8)
+    cl = np.full(n_nodes, -1, dtype=np.int32)
+    cr = np.full(n_nodes, -1, dtype=np.int32)
+    val = np.zeros((n_nodes, n_classes), dtype=np.float64)
+    for t, start, stop in zip(trees, offsets[:-1], offsets[1:]):
+        split = t.children_left != -1  # -- Hojas: feature -2, no se consultan
+        f = np.where(split, t.feature, 0)
+        feat[start:stop] = f
+        for j in range(n_feats):
+            on_j = split & (f == j)
+            thr[start:stop][on_j] = np.searchsorted(cuts[j], t.threshold[on_j])
+        ml[start:stop] = _missing_left(t)
+        cl[start:stop] = np.where(split, t.children_left + start, -1)
+        cr[start:stop] = np.where(split, t.children_right + start, -1)
+        v = t.value[:, 0, :]
+        val[start:stop] = v / v.sum(axis=1, keepdims=True)  # -- Igual que DecisionTree.predict_proba
+    return edges, root, feat, thr, ml, cl, cr, val
+
+
+def _rf_proba_kernel(X, edges, root, feat, thr, ml, cl, cr, val):
+    """Promedio de las probabilidades de hoja de todos los árboles, fila a fila."""
+    n_rows, n_feats, n_trees, n_classes = X.shape[0], edges.shape[0], root.shape[0], val.shape[1]
+    out = np.zeros((n_rows, n_classes))
+    xb = np.empty(n_feats, dtype=thr.dtype)
+    for i in range(n_rows):
+        # -- Discretizar la fila: número de cortes estrictamente menores que x (-1 = NaN)
+        for j in range(n_feats):
+            xb[j] = -1 if np.isnan(X[i, j]) else np.searchsorted(edges[j], X[i, j])
+        for t in range(n_trees):
+            node = root[t]
+            while cl[node] != -1:
+                b = xb[feat[node]]
+                if (ml[node] != 0) if b < 0 else (b <= thr[node]):
+                    node = cl[node]
+                else:
+                    node = cr[node]
+            for c in range(n_classes):  # -- Sin slices: evita arrays temporales
+                out[i, c] += val[node, c]
+        for c in range(n_classes):
+            out[i, c] /= n_trees
+    return out
+
+
+def _forest_codegen(m) -> Union[Callable[[np.ndarray], np.ndarray], None]:
+    """Genera y compila una función Python con cada árbol desplegado en if/else.
+
+    Alternativa sin numba: los umbrales y hojas quedan como constantes en el
+    código, sin indexar arrays ni pasar por la validación de sklearn.
+    """
+    forest = _forest_trees(m)
+    if forest is None or max(t.max_depth for t in forest[0]) > 90:
+        return None  # -- No es un bosque (o supera el límite de indentación de Python)
+    if sum(t.node_count for t in forest[0]) > CODEGEN_MAX_NODES:
+        return None  # -- Bosque demasiado grande: el código generado no compensa
+    trees, n_feats = forest
+    n_classes = trees[0].value.shape[2]
+
+    def emit(t, missing_left: np.ndarray, node: int, depth: int, lines: List[str]) -> None:
+        pad = "    " * depth
+        if t.children_left[node] == -1:
+            v = t.value[node, 0, :] / t.value[node, 0, :].sum()
+            lines.extend(f"{pad}o[{c}] += {float(p)!r}" for c, p in enumerate(v) if p)
+            return
+        x, test = f"x{t.feature[node]}", f"<= {float(t.threshold[node])!r}"
+        if missing_left[node]:  # -- NaN va a la izquierda (x != x solo es cierto para NaN)
+            lines.append(f"{pad}if {x} {test} or {x} != {x}:")
+        else:  # -- NaN falla la comparación y va a la derecha, como en sklearn
+            lines.append(f"{pad}if {x} {test}:")
+        emit(t, missing_left, t.children_left[node], depth + 1, lines)
+        lines.append(f"{pad}else:")
+        emit(t, missing_left, t.children_right[node], depth + 1, lines)
+
+    lines = [
+        "def _forest_score(X):",
+        "    out = np.empty((X.shape[0], %d))" % n_classes,
+        "    for i in range(X.shape[0]):",
+        "        %s, = X[i].tolist()" % ", ".join(f"x{j}" for j in range(n_feats)),
+        "        o = [0.0] * %d" % n_classes,
+    ]
+    for t in trees:
+        emit(t, _missing_left(t), 0, 2, lines)
+    lines += ["        out[i] = o", "    return out / %d" % len(trees)]
+
+    namespace = {"np": np}
+    exec(compile("\n".join(lines), "<forest>", "exec"), namespace)
+    return namespace["_forest_score"]
+
+
+def _probe_rows(trees: list, n_feats: int) -> np.ndarray:
+    """Filas de control: valores aleatorios, exactamente en cada umbral y con NaN."""
+    cuts = _feature_cuts(trees, n_feats)
+    lo = np.array([c.min() - 1.0 if c.size else 0.0 for c in cuts])
+    hi = np.array([c.max() + 1.0 if c.size else 1.0 for c in cuts])
+    base = np.random.default_rng(0).uniform(lo, hi, size=(64, n_feats))
+    rows = [base]
+    for j, c in enumerate(cuts):
+        on_cut = np.repeat(base[:1], c.size, axis=0)
+        on_cut[:, j] = c  # -- Empates exactos con el umbral
+        with_nan = base[:16].copy()
+        with_nan[:, j] = np.nan  # -- Valores faltantes en la columna j
+        rows += [on_cut, with_nan]
+    return np.vstack(rows).astype(np.float32)
+
+
+def _matches_model(score: Callable[[np.ndarray], np.ndarray]) -> bool:
+    """Comprueba que un recorrido alternativo reproduce predict_proba de sklearn."""
+    forest = _forest_trees(model)
+    if _proba is None or forest is None:
+        return False
+    X = _probe_rows(*forest)
+    return bool(np.allclose(score(X), _proba(X), rtol=0.0, atol=1e-9))  # -- Solo tolera redondeo
+
+
+# -- Kernel compilado y arrays del bosque (None si no aplica); sin numba, código generado
+_rf_proba = njit(cache=True)(_rf_proba_kernel) if njit is not None else None
+_forest = _forest_arrays(model) if _rf_proba is not None else None
+if _forest is not None and not _matches_model(lambda X: _rf_proba(X, *_forest)):
+    app.logger.warning("El bosque compilado no coincide con sklearn; se usa predict_proba.")
+    _forest = None
+_forest_py = _forest_codegen(model) if _forest is None and model is not None else None
+if _forest_py is not None and not _matches_model(_forest_py):
+    app.logger.warning("El bosque generado no coincide con sklearn; se usa predict_proba.")
+    _forest_py = None
+
+# -- Predicción de calentamiento: carga los árboles en memoria y compila el kernel
+if model is not None:
+    _pred(np.zeros((1, n_features), dtype=np.float32))
+    if _forest is not None:
+        _rf_proba(np.zeros((1, n_features), dtype=np.float32), *_forest)
+
+
+# --------------------------- Respuestas JSON --------------------------------
+def _json(obj: dict, status: int = 200) -> Response:
+    """Serializa con orjson y devuelve una respuesta application/json."""
+    return Response(
+        orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY), status=status, mimetype="application/json"
+    )
+
+
+def _to_builtin(obj):
+    """Convierte arrays y escalares de NumPy a tipos nativos para msgpack."""
+    if isinstance(obj, (np.ndarray, np.generic)):
+        return obj.tolist()
+    raise TypeError(f"Tipo no serializable: {type(obj).__name__}")
+
+
+def _msgpack(obj: dict, status: int = 200) -> Response:
+    """Serializa con msgpack y devuelve una respuesta application/msgpack."""
+    return Response(msgpack.packb(obj, default=_to_builtin), status=status, mimetype=MSGPACK_MIMETYPES[0])
+
 
 # ----------------------------- Endpoints -----------------------------------
 
 @app.get("/")
 def root():
     """Endpoint raíz — devuelve documentación breve de la API."""
-    return jsonify(
+    return _json(
         {
             "message": "API de Clasificación Iris",  # -- Mensaje principal
             "status": "success",                     # -- Estado de respuesta
@@ -70,7 +329,7 @@ def root():
             "endpoints": {                           # -- Lista de endpoints disponibles
                 "GET /": "Documentación de la API",
                 "GET /health": "Estado del servicio y metadatos del modelo",
-                "POST /predict": "Clasificación de flores Iris",
+                "POST /predict": "Clasificación de flores Iris (JSON o msgpack)",
             },
             "usage": {"predict_example": {"features": [5.1, 3.5, 1.4, 0.2]}},  # -- Ejemplo de uso de /predict
             "schema": {"POST /predict": {"features": ["float", "float", "float", "float"]}},  # -- Formato esperado
@@ -89,25 +348,27 @@ def root():
 def health():
     """Endpoint de salud del servicio — devuelve estado y metadatos."""
     ok = model is not None  # -- Determinar si el modelo está cargado
-    return (
-        jsonify(
-            {
-                "status": "ok" if ok else "error",  # -- Estado general
-                "message": "Servicio saludable" if ok else "Modelo no cargado",  # -- Mensaje descriptivo
-                "model_loaded": ok,                 # -- Booleano de carga de modelo
-                "version": API_VERSION,             # -- Versión de la API
-                "n_features": n_features,           # -- Número de features esperadas
-                "class_names": class_names,         # -- Nombres de clases
-                "test_accuracy": test_accuracy,     # -- Accuracy de test del modelo
-            }
-        ),
+    return _json(
+        {
+            "status": "ok" if ok else "error",  # -- Estado general
+            "message": "Servicio saludable" if ok else "Modelo no cargado",  # -- Mensaje descriptivo
+            "model_loaded": ok,                 # -- Booleano de carga de modelo
+            "version": API_VERSION,             # -- Versión de la API
+            "n_features": n_features,           # -- Número de features esperadas
+            "class_names": class_names,         # -- Nombres de clases
+            "test_accuracy": test_accuracy,     # -- Accuracy de test del modelo
+        },
         200 if ok else 500,  # -- Código HTTP (200 si todo bien, 500 si hay error)
     )
 
 
 # ----------------------- Validación de entrada ------------------------------
-def _validate(payload: dict) -> Tuple[bool, Union[str, np.ndarray]]:
-    """Valida el JSON de entrada para /predict."""
+_F32_MAX = float(np.finfo(np.float32).max)  # -- Mayor valor representable en float32
+_NAN = float("nan")  # -- Único objeto NaN para las claves: hash(nan) depende de la identidad
+
+
+def _validate(payload: dict) -> Tuple[bool, Union[str, Tuple[float, ...]]]:
+    """Valida el JSON de entrada para /predict y devuelve las features como clave."""
     if not isinstance(payload, dict):
         return False, "El cuerpo debe ser un objeto JSON con la clave 'features'."
     if "features" not in payload:
@@ -117,11 +378,21 @@ def _validate(payload: dict) -> Tuple[bool, Union[str, np.ndarray]]:
         return False, "La clave 'features' debe ser una lista."
     if len(feats) != n_features:
         return False, f"Se esperaban {n_features} valores numéricos, se recibieron {len(feats)}."
-    try:
-        x = np.asarray(feats, dtype=float).reshape(1, -1)  # -- Convertir a array 2D para sklearn
-    except Exception:
-        return False, "Todos los elementos de 'features' deben ser numéricos (int/float)."
-    return True, x
+    has_nan = False
+    for v in feats:
+        # -- Solo int/float (bool es subclase de int y se rechaza; también strings)
+        if type(v) not in (int, float):
+            return False, "Todos los elementos de 'features' deben ser numéricos (int/float)."
+        # -- Infinity o valores que no caben en float32 (NaN se admite: valor faltante)
+        if not abs(v) <= _F32_MAX:
+            if v == v:
+                return False, "Los valores de 'features' están fuera de rango."
+            has_nan = True
+    # -- Clave inmutable con los valores redondeados a float32 (lo que ve el modelo)
+    vals = array("f", feats).tolist()
+    if has_nan:  # -- Mismo objeto NaN para que la clave coincida en las cachés LRU
+        vals = [_NAN if v != v else v for v in vals]
+    return True, tuple(vals)
 
 
 # ----------------------- Endpoint /predict ----------------------------------
@@ -130,47 +401,191 @@ def predict():
     """Clasificación de flores Iris a partir de 4 características."""
     # -- Validar que el modelo esté cargado
     if model is None:
-        return jsonify({"status": "error", "error": "Modelo no disponible."}), 500
+        return _json({"status": "error", "error": "Modelo no disponible."}, 500)
 
-    # -- Validar que el Content-Type sea JSON
-    if not request.is_json:
-        return jsonify({"status": "error", "error": "Content-Type debe ser application/json"}), 400
+    # -- Transporte binario: cuerpo y respuesta en msgpack
+    binary = request.mimetype in MSGPACK_MIMETYPES
+    reply = _msgpack if binary else _json
 
-    # -- Obtener JSON del cuerpo de la solicitud
-    payload = request.get_json(silent=True)
-    if payload is None:
-        return jsonify({"status": "error", "error": "JSON inválido o vacío."}), 400
+    # -- Validar que el Content-Type sea JSON (o msgpack)
+    if not binary and not request.is_json:
+        return _json({"status": "error", "error": "Content-Type debe ser application/json o application/msgpack"}, 400)
+
+    # -- Obtener el cuerpo de la solicitud
+    if binary:
+        try:
+            payload = msgpack.unpackb(request.get_data(), raw=False)
+        except (ValueError, msgpack.UnpackException):
+            return reply({"status": "error", "error": "msgpack inválido o vacío."}, 400)
+    else:
+        payload = request.get_json(silent=True)
+        if payload is None:
+            return reply({"status": "error", "error": "JSON inválido o vacío."}, 400)
 
     # -- Validar la estructura y contenido
-    ok, x = _validate(payload)
+    # -- key: tupla exacta de features en float32 (clave de caché; no altera la predicción)
+    ok, key = _validate(payload)
     if not ok:
-        return jsonify({"status": "error", "error": x}), 400
+        return reply({"status": "error", "error": key}, 400)
+
+    # -- Respuesta final (cuerpo pre-serializado: ejemplos de demo o caché LRU)
+    body = _PRECOMPUTED.get((key, binary))
+    if body is None:
+        try:
+            body = _predict_body(key, binary)
+        except TimeoutError:
+            return reply({"status": "error", "error": "Tiempo de predicción agotado."}, 503)
+    return Response(body, status=200, mimetype=MSGPACK_MIMETYPES[0] if binary else "application/json")
+
+
+# ----------------------- Caché de predicciones ------------------------------
+@lru_cache(maxsize=CACHE_SIZE)
+def _score(key: Tuple[float, ...]) -> Tuple[int, np.ndarray]:
+    """Ejecuta el modelo para un vector de features (memoizado por clave)."""
+    x = np.asarray(key, dtype=np.float32).reshape(1, -1)
+    if BATCH_MAX_SIZE > 1:
+        return _submit(x)  # -- Micro-batching activado
+    return _predict_split(x)[0]
+
+
+# ----------------------------- Micro-batching -------------------------------
+_batch_queue: "queue.Queue[tuple]" = queue.Queue()  # -- (x, evento, resultado)
+_batch_lock = threading.Lock()  # -- Protege el arranque del hilo
+_batch_thread: Union[threading.Thread, None] = None
+
+
+def _predict_rows(X: np.ndarray) -> Tuple[np.ndarray, Union[np.ndarray, None]]:
+    """Predice un lote (B x n_features) con una sola llamada al modelo."""
+    # -- Bosque compilado o generado: la clase es el argmax de las probabilidades
+    if _forest is not None:
+        proba = _rf_proba(X, *_forest)
+        return proba.argmax(axis=1), proba
+    if _forest_py is not None:
+        proba = _forest_py(X)
+        return proba.argmax(axis=1), proba
+
+    # -- Un solo recorrido del modelo: la clase es el argmax de predict_proba
+    if _proba is not None:
+        proba = _proba(X)
+        return proba.argmax(axis=1), proba
+
+    # -- Modelos sin predict_proba: solo la clase
+    return _pred(X), None
+
 
-    # -- Predicción de la clase
-    idx = int(model.predict(x)[0])
+def _predict_split(X: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """Predice un lote y lo separa en (clase, probabilidades) por fila."""
+    idx, proba = _predict_rows(X)
+    if proba is None:
+        proba = np.empty((len(X), 0))
+    proba.flags.writeable = False  # -- Las filas quedan en caché: solo lectura
+    return [(int(idx[i]), proba[i]) for i in range(len(X))]
 
-    # -- Obtener probabilidades si el modelo soporta predict_proba
-    if hasattr(model, "predict_proba"):
-        proba_list = model.predict_proba(x)[0].tolist()
-        probs_dict = {class_names[i]: f"{proba_list[i]:.3f}" for i in range(len(class_names))}
+
+def _batch_worker() -> None:
+    """Agrupa las solicitudes encoladas y las predice juntas."""
+    while True:
+        items = [_batch_queue.get()]  # -- Bloquea hasta la primera solicitud
+
+        # -- Tomar sin esperar lo que ya está en cola (llegó mientras se predecía el lote anterior)
+        while len(items) < BATCH_MAX_SIZE:
+            try:
+                items.append(_batch_queue.get_nowait())
+            except queue.Empty:
+                break
+
+        # -- Ventana de espera opcional (BATCH_WAIT_MS > 0) para lotes más grandes
+        deadline = time.monotonic() + BATCH_WAIT_MS / 1000.0
+        while BATCH_WAIT_MS > 0 and len(items) < BATCH_MAX_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                items.append(_batch_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            results = _predict_split(np.vstack([x for x, _, _ in items]))
+        except Exception as exc:  # -- Propagar el error a cada solicitud
+            results = [exc] * len(items)
+
+        # -- Devolver cada fila a su solicitud y despertarla
+        for (_, done, slot), result in zip(items, results):
+            slot.append(result)
+            done.set()
+
+
+def _ensure_batcher() -> None:
+    """Arranca el hilo de micro-batching en el primer uso (también tras fork)."""
+    global _batch_thread
+    if _batch_thread is not None and _batch_thread.is_alive():
+        return
+    with _batch_lock:
+        if _batch_thread is None or not _batch_thread.is_alive():
+            _batch_thread = threading.Thread(target=_batch_worker, name="predict-batcher", daemon=True)
+            _batch_thread.start()
+
+
+def _submit(x: np.ndarray) -> Tuple[int, np.ndarray]:
+    """Encola una fila para el micro-batcher y espera su resultado."""
+    _ensure_batcher()
+    done, slot = threading.Event(), []
+    _batch_queue.put((x, done, slot))
+    if not done.wait(BATCH_TIMEOUT_S):
+        raise TimeoutError("El micro-batcher no respondió a tiempo.")
+    if isinstance(slot[0], Exception):
+        raise slot[0]
+    return slot[0]
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _predict_body(key: Tuple[float, ...], binary: bool = False) -> bytes:
+    """Cuerpo serializado (JSON o msgpack) de /predict para una clave (memoizado)."""
+    idx, proba = _score(key)
+    return _build_body(idx, proba, binary)
+
+
+def _build_body(idx: int, proba: np.ndarray, binary: bool) -> bytes:
+    """Serializa la respuesta de /predict para una clase y sus probabilidades."""
+    if proba.size:
+        probs_dict = dict(zip(class_names, proba))
     else:
-        proba_list = []
-        probs_dict = {class_names[idx]: "1.000"}
-
-    # -- Respuesta JSON final
-    return (
-        jsonify(
-            {
-                "status": "success",
-                "prediction": class_names[idx],
-                "prediction_index": idx,
-                "probabilities": probs_dict,
-                "proba": proba_list,
-                "target_names": class_names,
-            }
-        ),
-        200,
-    )
+        probs_dict = {class_names[idx]: 1.0}
+
+    result = {
+        "status": "success",
+        "prediction": class_names[idx],
+        "prediction_index": idx,
+        "probabilities": probs_dict,
+        "proba": proba,  # -- ndarray serializado directamente por orjson
+        "target_names": class_names,
+    }
+    if binary:
+        return msgpack.packb(result, default=_to_builtin)
+    return orjson.dumps(result, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+# ----------------------- Ejemplos precalculados -----------------------------
+# -- Ejemplos de demo del frontend (Setosa, Versicolor, Virginica)
+DEMO_FEATURES = ([5.1, 3.5, 1.4, 0.2], [5.9, 3.0, 4.2, 1.5], [6.7, 3.0, 5.2, 2.3])
+
+
+def _precompute() -> Dict[Tuple[Tuple[float, ...], bool], bytes]:
+    """Respuestas (JSON y msgpack) de los ejemplos de demo, calculadas al arrancar."""
+    if model is None or n_features != len(DEMO_FEATURES[0]):
+        return {}
+    X = np.asarray(DEMO_FEATURES, dtype=np.float32)
+    results = _predict_split(X)  # -- Directo, sin arrancar el micro-batcher antes del fork
+    return {
+        (tuple(row.tolist()), binary): _build_body(idx, proba, binary)
+        for row, (idx, proba) in zip(X, results)
+        for binary in (False, True)
+    }
+
+
+# -- Clave: (features como en _validate, binario); nunca se desaloja
+_PRECOMPUTED = _precompute()
 
 
 # --------------------------------- Main -------------------------------------
@@ -5,7 +5,7 @@
 # Descripción:
 #   Interfaz web con Streamlit para probar la API de clasificación Iris.
 #   Incluye botones de prueba rápida y maneja dos formatos de respuesta:
-#   - {"probabilities": {"setosa":"1.000", ...}}
+#   - {"probabilities": {"setosa": 1.0, ...}}  (versiones previas: "1.000")
 #   - {"proba": [0.9, 0.1, 0.0], "target_names": [...]}
 # Uso:
 #   streamlit run frontend.py   → http://localhost:8501  (o el que definas)
@@ -14,6 +14,7 @@
 import os
 import json
 import requests
+from requests.adapters import HTTPAdapter
 import streamlit as st
 
 # -- Configuración de la página Streamlit
@@ -26,6 +27,59 @@ Esta interfaz envía peticiones a la API Flask:
 - Predicción: `POST /predict` con `{"features":[...]}`
 """)
 
+# -------- Llamadas a la API (cacheadas entre reruns de Streamlit) --------
+class ApiError(Exception):
+    """Respuesta no-200 de la API (no se cachea: se reintenta en el próximo clic)."""
+
+    def __init__(self, status: int, body):
+        super().__init__(f"HTTP {status}")
+        self.status = status  # -- Código HTTP
+        self.body = body      # -- JSON (dict) o texto plano
+
+
+def _parse(r: requests.Response) -> dict:
+    """Devuelve el JSON de una respuesta 200 o lanza ApiError."""
+    try:
+        body = r.json()
+    except ValueError:
+        body = r.text
+    if r.status_code != 200:
+        raise ApiError(r.status_code, body)
+    return body
+
+
+def get_session() -> requests.Session:
+    """Sesión HTTP propia de cada usuario, reutilizada entre reruns (keep-alive)."""
+    if "http_session" not in st.session_state:
+        session = requests.Session()
+        adapter = HTTPAdapter(max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        st.session_state["http_session"] = session
+    return st.session_state["http_session"]
+
+
+@st.cache_data(ttl=30, show_spinner=False)
+def fetch_health(base: str) -> dict:
+    """GET /health — estable durante la sesión, se cachea 30 s."""
+    return _parse(get_session().get(f"{base}/health", timeout=5))
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def fetch_predict(base: str, sl: float, sw: float, pl: float, pw: float) -> dict:
+    """POST /predict — cachea las últimas 256 combinaciones de features."""
+    return _parse(get_session().post(f"{base}/predict", json={"features": [sl, sw, pl, pw]}, timeout=5))
+
+
+def show_api_error(endpoint: str, e: ApiError) -> None:
+    """Muestra el código y el cuerpo de una respuesta de error."""
+    st.error(f"Error en {endpoint} (código {e.status})")
+    if isinstance(e.body, dict):
+        st.json(e.body)
+    else:
+        st.text(e.body)
+
+
 # -------- Config de API (lee de variable de entorno y permite editar) --------
 default_api = os.getenv("API_URL", "http://127.0.0.1:5002")  # -- URL por defecto
 api_base = st.text_input("URL base de la API", default_api)   # -- Permite cambiar URL
@@ -36,38 +90,32 @@ col = st.columns(2)
 with col[0]:
     if st.button("Probar /health"):
         try:
-            r = requests.get(f"{api_base}/health", timeout=5)
-            if r.status_code == 200:
-                data = r.json()
-
-                # -- Mensaje de estado
-                st.success("API saludable")
-
-                # -- Métricas rápidas en 3 columnas
-                m1, m2, m3 = st.columns(3)
-                m1.metric("Versión", data.get("version", "-"))
-                m2.metric("Features", data.get("n_features", "-"))
-
-                acc = data.get("test_accuracy")
-                if isinstance(acc, (int, float)):
-                    m3.metric("Accuracy (test)", f"{acc*100:.1f}%")
-                else:
-                    m3.metric("Accuracy (test)", "-")
-
-                # -- Mostrar clases
-                clases = data.get("class_names") or []
-                if clases:
-                    st.write("**Clases:** " + ", ".join(map(str, clases)))
-
-                # -- JSON completo en expander
-                with st.expander("Ver JSON completo de /health"):
-                    st.json(data)
+            data = fetch_health(api_base)
+
+            # -- Mensaje de estado
+            st.success("API saludable")
+
+            # -- Métricas rápidas en 3 columnas
+            m1, m2, m3 = st.columns(3)
+            m1.metric("Versión", data.get("version", "-"))
+            m2.metric("Features", data.get("n_features", "-"))
+
+            acc = data.get("test_accuracy")
+            if isinstance(acc, (int, float)):
+                m3.metric("Accuracy (test)", f"{acc*100:.1f}%")
             else:
-                st.error(f"Error en /health (código {r.status_code})")
-                try:
-                    st.json(r.json())
-                except Exception:
-                    st.text(r.text)
+                m3.metric("Accuracy (test)", "-")
+
+            # -- Mostrar clases
+            clases = data.get("class_names") or []
+            if clases:
+                st.write("**Clases:** " + ", ".join(map(str, clases)))
+
+            # -- JSON completo en expander
+            with st.expander("Ver JSON completo de /health"):
+                st.json(data)
+        except ApiError as e:
+            show_api_error("/health", e)
         except Exception as e:
             st.error(f"Error al conectar con la API: {e}")
 
@@ -104,48 +152,40 @@ pw = st.number_input("Petal width",  key="pw", step=0.1)
 
 # -------- Enviar predicción --------
 if st.button("Enviar a /predict"):
-    payload = {"features": [sl, sw, pl, pw]}  # -- Construir JSON de entrada
     try:
-        r = requests.post(f"{api_base}/predict", json=payload, timeout=5)
-        if r.status_code == 200:
-            result = r.json()
-
-            # -- Mostrar clase predicha
-            pred_name = result.get("prediction", "N/A")
-            st.success(f"Clase predicha: {pred_name}")
-
-            # -- Extraer probabilidades (soporta dict o lista)
-            probs = {}
-            if isinstance(result.get("probabilities"), dict):
-                probs = {k: float(v) for k, v in result["probabilities"].items() if v is not None}
-            elif result.get("proba") is not None:
-                names = result.get("target_names") or result.get("class_names") or []
-                for name, p in zip(names, result["proba"]):
-                    probs[name] = float(p)
-
-            # -- Mostrar probabilidades por clase en columnas
-            if probs:
-                st.write("**Probabilidades por clase:**")
-                ordenadas = sorted(probs.items(), key=lambda x: x[1], reverse=True)
-                cols = st.columns(len(ordenadas))
-                for (name, p), c in zip(ordenadas, cols):
-                    c.metric(name, f"{p*100:.1f}%")
-
-                # -- JSON completo en expander
-                with st.expander("Ver detalle y JSON de respuesta"):
-                    for name, p in ordenadas:
-                        st.write(f"- {name}: {p:.3f}")
-                    st.json(result)
-            else:
-                # -- Si no hay probabilidades, al menos mostrar JSON
-                with st.expander("Ver respuesta JSON completa"):
-                    st.json(result)
+        result = fetch_predict(api_base, sl, sw, pl, pw)
+
+        # -- Mostrar clase predicha
+        pred_name = result.get("prediction", "N/A")
+        st.success(f"Clase predicha: {pred_name}")
+
+        # -- Extraer probabilidades (soporta dict o lista)
+        probs = {}
+        if isinstance(result.get("probabilities"), dict):
+            probs = {k: float(v) for k, v in result["probabilities"].items() if v is not None}
+        elif result.get("proba") is not None:
+            names = result.get("target_names") or result.get("class_names") or []
+            probs = dict(zip(names, map(float, result["proba"])))
+
+        # -- Mostrar probabilidades por clase en columnas
+        if probs:
+            st.write("**Probabilidades por clase:**")
+            ordenadas = sorted(probs.items(), key=lambda x: x[1], reverse=True)
+            cols = st.columns(len(ordenadas))
+            for (name, p), c in zip(ordenadas, cols):
+                c.metric(name, f"{p*100:.1f}%")
+
+            # -- JSON completo en expander
+            with st.expander("Ver detalle y JSON de respuesta"):
+                for name, p in ordenadas:
+                    st.write(f"- {name}: {p:.3f}")
+                st.json(result)
         else:
-            st.error(f"Error en la predicción (Código: {r.status_code})")
-            try:
-                st.json(r.json())
-            except Exception:
-                st.text(r.text)
+            # -- Si no hay probabilidades, al menos mostrar JSON
+            with st.expander("Ver respuesta JSON completa"):
+                st.json(result)
+    except ApiError as e:
+        show_api_error("la predicción", e)
     except Exception as e:
         st.error(f"Error al conectar con la API: {e}")
 
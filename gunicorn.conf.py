@@ -0,0 +1,30 @@
+# ============================================================================
+# gunicorn.conf.py — Configuración de gunicorn para servir la API Iris
+# Autor: John Gómez
+# Descripción:
+#   Servidor WSGI multiproceso para producción (reemplaza al servidor de
+#   desarrollo de Flask). Con preload_app el modelo se carga una sola vez en
+#   el proceso maestro y los workers comparten sus páginas de memoria (COW).
+# Uso:
+#   gunicorn -c gunicorn.conf.py app:app
+# ============================================================================
+
+import os
+
+# -- Dirección de escucha (mismo puerto que app.py)
+bind = f"0.0.0.0:{os.getenv('PORT', '5002')}"
+
+# -- Un proceso por núcleo: el paralelismo real evita el GIL
+workers = int(os.getenv("WEB_CONCURRENCY", os.cpu_count() or 1))
+
+# -- Hilos por worker: atienden solicitudes concurrentes (y, con BATCH_MAX_SIZE > 1,
+#    permiten al micro-batcher agruparlas)
+worker_class = "gthread"
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+# -- Cargar app.py (y el modelo) en el maestro antes de hacer fork
+preload_app = True
+
+# -- Logs a stdout/stderr (visibles con docker logs)
+accesslog = "-"
+errorlog = "-"
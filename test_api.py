@@ -6,7 +6,7 @@
 # Uso:
 #   python test_api.py                 # usa http://127.0.0.1:5000
 #   python test_api.py --base-url ...  # para otro puerto/host
-# Requisitos: requests
+# Requisitos: requests, msgpack
 # ======================================================================
 
 from __future__ import annotations
@@ -16,11 +16,18 @@ import json
 import sys
 from typing import Tuple
 
+import msgpack
 import requests
+from requests.adapters import HTTPAdapter
+
+# -- Sesión HTTP compartida: reutiliza conexiones (keep-alive) entre pruebas
+_SESSION = requests.Session()
+_SESSION.mount("http://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
+_SESSION.mount("https://", HTTPAdapter(pool_connections=32, pool_maxsize=32, max_retries=0))
 
 # -- Función helper para GET
 def get(base: str, path: str) -> Tuple[int, dict]:
-    r = requests.get(base + path, timeout=10)
+    r = _SESSION.get(base + path, timeout=10)
     try:
         return r.status_code, r.json()  # -- Devuelve código y JSON
     except Exception:
@@ -28,12 +35,25 @@ def get(base: str, path: str) -> Tuple[int, dict]:
 
 # -- Función helper para POST
 def post(base: str, path: str, payload: dict) -> Tuple[int, dict]:
-    r = requests.post(base + path, json=payload, timeout=10)
+    r = _SESSION.post(base + path, json=payload, timeout=10)
     try:
         return r.status_code, r.json()
     except Exception:
         return r.status_code, {"raw": r.text}
 
+# -- Función helper para POST con transporte binario (msgpack)
+def post_msgpack(base: str, path: str, payload: dict) -> Tuple[int, dict]:
+    r = _SESSION.post(
+        base + path,
+        data=msgpack.packb(payload),
+        headers={"Content-Type": "application/msgpack"},
+        timeout=10,
+    )
+    try:
+        return r.status_code, msgpack.unpackb(r.content, raw=False)
+    except Exception:
+        return r.status_code, {"raw": r.text}
+
 # -- Función principal de pruebas
 def main() -> int:
     # -- Argumentos de línea de comando
@@ -78,6 +98,26 @@ def main() -> int:
     if sc != 400:
         failures.append("Predict inválido (tipo) debería devolver 400")
 
+    # 6) /predict válido con msgpack
+    sc, js = post_msgpack(base, "/predict", payload)
+    print("[/predict msgpack]", sc, json.dumps(js, ensure_ascii=False))
+    if sc != 200 or js.get("status") != "success" or "prediction" not in js:
+        failures.append("Predict msgpack no devolvió success")
+
+    # 7) /predict con NaN (valor faltante): sigue la dirección de missing de cada nodo
+    payload_nan = {"features": [6.0, 3.0, float("nan"), 1.5]}
+    sc, js = post_msgpack(base, "/predict", payload_nan)
+    print("[/predict NaN]", sc, json.dumps(js, ensure_ascii=False))
+    if sc != 200 or js.get("status") != "success" or abs(sum(js.get("proba", [])) - 1.0) > 1e-6:
+        failures.append("Predict con NaN no devolvió probabilidades válidas")
+
+    # 8) /predict inválido (infinito / fuera de rango float32)
+    payload_inf = {"features": [float("inf"), 3.0, 1.4, 0.2]}
+    sc, js = post_msgpack(base, "/predict", payload_inf)
+    print("[/predict inválido (inf)]", sc, json.dumps(js, ensure_ascii=False))
+    if sc != 400:
+        failures.append("Predict con infinito debería devolver 400")
+
     # -- Reporte final de errores o éxito
     if failures:
         print("\nFALLAS:")
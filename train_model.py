@@ -43,7 +43,7 @@ def main() -> None:
 
     # -- Cargar dataset Iris
     iris = load_iris()
-    X, y = iris.data, iris.target
+    X, y = iris.data.astype(np.float32), iris.target  # -- float32: el dtype interno de los árboles
     feature_names = iris.feature_names
     class_names = iris.target_names.tolist()
 
@@ -75,8 +75,8 @@ def main() -> None:
         },
     }
 
-    # -- Guardar artefacto comprimido con joblib (xz, nivel 3)
-    joblib.dump(artifact, args.output, compress=("xz", 3))
+    # -- Guardar artefacto sin comprimir: la API lo carga sin descompresión xz al arrancar
+    joblib.dump(artifact, args.output)
 
     # -- Resumen legible por consola
     summary = {